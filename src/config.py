@@ -2,21 +2,29 @@
 This module contains the schema for the configuration file.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+import re
 import yaml
-import humanfriendly
 from schema import Schema, And, Or, Use, Optional
 from logger import LogLevel
-from plc_reader import PLCEndianness, PLCValueType, PLCRegisterType
+from plc_reader import PLCEndianness, PLCValueType, PLCRegisterType, ReadSpec
 from constants import (
     DEFAULT_SCRAPE_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_IDENTIFER,
     DEFAULT_LOG_LEVEL,
     DEFAULT_NAMESPACE,
+    DEFAULT_MAX_GAP,
+    DEFAULT_MAX_REGISTERS_PER_REQUEST,
+    RESERVED_LABEL_NAMES,
 )
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YAMLLoader
+
 
 class MetricLayout(Enum):
     """
@@ -27,6 +35,45 @@ class MetricLayout(Enum):
     STATIC = "static"
 
 
+_PORT = And(Use(int), lambda n: 1 <= n <= 65535)
+_NON_EMPTY_STR = And(str, len)
+_ENDIANNESS = Use(PLCEndianness)
+_VALUE_TYPE = Use(PLCValueType)
+_ADDRESS = And(Use(int), lambda n: n >= 0)
+_SIZE = And(Use(int), lambda n: n > 0)
+
+
+def _register_schema(register_type: PLCRegisterType, bit: bool) -> dict:
+    """
+    Build the schema for a single register entry.
+
+    Bit registers (coils and discrete inputs) only hold booleans, so their value
+    type is fixed and defaults to `bool`.
+    """
+    if bit:
+        value_type = {
+            Optional("value_type", default=PLCValueType.BOOL): And(
+                _VALUE_TYPE, PLCValueType.BOOL
+            )
+        }
+        mock = Or(0, 1, True, False)
+    else:
+        value_type = {"value_type": _VALUE_TYPE}
+        mock = Or(int, str, bool, float)
+
+    return {
+        "name": _NON_EMPTY_STR,
+        "description": str,
+        "address": _ADDRESS,
+        **value_type,
+        Optional("register_type", default=register_type): Use(
+            lambda x: PLCRegisterType[x.upper()]
+        ),
+        Optional("size", default=1): _SIZE,
+        Optional("mock", default=0): mock,
+    }
+
+
 PLC_EXPORTER_SCHEMA = Schema(
     {
         Optional(
@@ -34,87 +81,48 @@ PLC_EXPORTER_SCHEMA = Schema(
             default={
                 "port": DEFAULT_PORT,
                 "scrape_interval": DEFAULT_SCRAPE_INTERVAL,
-                "log_level": DEFAULT_LOG_LEVEL,
+                "log_level": LogLevel[DEFAULT_LOG_LEVEL.upper()],
             },
         ): {
-            Optional("port", default=DEFAULT_PORT): And(
-                Use(int), lambda n: 1 <= n <= 65535
-            ),
+            Optional("port", default=DEFAULT_PORT): _PORT,
             Optional("scrape_interval", default=DEFAULT_SCRAPE_INTERVAL): str,
-            Optional("log_level", default=LogLevel.INFO): And(
-                Use(lambda x: x.upper()), Or(*[level.name for level in LogLevel])
+            Optional("log_level", default=LogLevel.INFO): Use(
+                lambda x: LogLevel[x.upper()]
             ),
         },
         "plc": {
-            "host": And(str, len),
-            "port": And(Use(int), lambda n: 1 <= n <= 65535),
-            Optional("endianness", default=PLCEndianness.BIG.value): Or(
-                *[t.value for t in PLCEndianness]
-            ),
-            Optional("word_order", default=PLCEndianness.BIG.value): Or(
-                *[t.value for t in PLCEndianness]
+            "host": _NON_EMPTY_STR,
+            "port": _PORT,
+            Optional("endianness", default=PLCEndianness.BIG): _ENDIANNESS,
+            Optional("word_order", default=PLCEndianness.BIG): _ENDIANNESS,
+            Optional("max_gap", default=DEFAULT_MAX_GAP): And(
+                Use(int), lambda n: n >= 0
             ),
+            Optional(
+                "max_registers_per_request", default=DEFAULT_MAX_REGISTERS_PER_REQUEST
+            ): And(Use(int), lambda n: 1 <= n <= 125),
         },
-        Optional("namespace", default=DEFAULT_NAMESPACE): And(str, len),
-        Optional("identifier", default=DEFAULT_IDENTIFER): And(str, len),
-        Optional("metric_layout", default=MetricLayout.DYNAMIC): Or(
-            *[t.value for t in MetricLayout]
-        ),
+        Optional("namespace", default=DEFAULT_NAMESPACE): _NON_EMPTY_STR,
+        Optional("identifier", default=DEFAULT_IDENTIFER): _NON_EMPTY_STR,
+        Optional("metric_layout", default=MetricLayout.DYNAMIC): Use(MetricLayout),
         Optional("mock", default=False): bool,
-        Optional("static_labels", default={}): dict,
+        Optional("static_labels", default={}): And(
+            dict,
+            lambda labels: not RESERVED_LABEL_NAMES & labels.keys(),
+            error="static_labels must not use the reserved label names "
+            + ", ".join(sorted(RESERVED_LABEL_NAMES)),
+        ),
         Optional("coils", default=[]): [
-            {
-                "name": And(str, len),
-                "description": str,
-                "address": And(Use(int), lambda n: n >= 0),
-                Optional("value_type", default=PLCValueType.BOOL.value): Or(
-                    PLCValueType.BOOL.value
-                ),
-                Optional("register_type", default=PLCRegisterType.COILS.value): str,
-                Optional("size", default=1): And(Use(int), lambda n: n > 0),
-                Optional("mock", default=0): Or(0, 1, True, False),
-            }
+            _register_schema(PLCRegisterType.COILS, bit=True)
         ],
         Optional("discrete_inputs", default=[]): [
-            {
-                "name": And(str, len),
-                "description": str,
-                "address": And(Use(int), lambda n: n >= 0),
-                Optional("value_type", default=PLCValueType.BOOL.value): Or(
-                    PLCValueType.BOOL.value
-                ),
-                Optional(
-                    "register_type", default=PLCRegisterType.DISCRETE_INPUTS.value
-                ): str,
-                Optional("size", default=1): And(Use(int), lambda n: n > 0),
-                Optional("mock", default=0): Or(0, 1, True, False),
-            }
+            _register_schema(PLCRegisterType.DISCRETE_INPUTS, bit=True)
         ],
         Optional("input_registers", default=[]): [
-            {
-                "name": And(str, len),
-                "description": str,
-                "address": And(Use(int), lambda n: n >= 0),
-                "value_type": Or(*[t.value for t in PLCValueType]),
-                Optional(
-                    "register_type", default=PLCRegisterType.INPUT_REGISTERS.value
-                ): str,
-                Optional("size", default=1): And(Use(int), lambda n: n > 0),
-                Optional("mock", default=0): Or(int, str, bool, float),
-            }
+            _register_schema(PLCRegisterType.INPUT_REGISTERS, bit=False)
         ],
         Optional("holding_registers", default=[]): [
-            {
-                "name": And(str, len),
-                "description": str,
-                "address": And(Use(int), lambda n: n >= 0),
-                "value_type": Or(*[t.value for t in PLCValueType]),
-                Optional(
-                    "register_type", default=PLCRegisterType.HOLDING_REGISTERS.value
-                ): str,
-                Optional("size", default=1): And(Use(int), lambda n: n > 0),
-                Optional("mock", default=0): Or(int, str, bool, float),
-            }
+            _register_schema(PLCRegisterType.HOLDING_REGISTERS, bit=False)
         ],
     }
 )
@@ -126,7 +134,7 @@ class ConfigError(Exception):
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class RegisterConfig:
     """
     Configuration for a single register.
@@ -139,18 +147,26 @@ class RegisterConfig:
     register_type: PLCRegisterType
     size: int = 1
     mock: any = 0
+    address_label: str = field(init=False, repr=False, compare=False)
+    read_spec: ReadSpec = field(init=False, repr=False, compare=False)
+    # Metric state resolved once by the exporter at startup
+    metric_name: str = field(default=None, init=False, repr=False, compare=False)
+    metric_description: str = field(default=None, init=False, repr=False, compare=False)
+    gauge_child: any = field(default=None, init=False, repr=False, compare=False)
+    latency_child: any = field(default=None, init=False, repr=False, compare=False)
+    error_child: any = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
-    def from_dict(
-        cls, value_type: str, register_type: str, **kwargs
-    ) -> "RegisterConfig":
+    def from_dict(cls, **kwargs) -> "RegisterConfig":
         """
-        Create a RegisterConfig from a dictionary.
+        Create a RegisterConfig from a validated dictionary.
         """
-        return cls(
-            value_type=PLCValueType[value_type.upper()],
-            register_type=PLCRegisterType[register_type.upper()],
-            **kwargs,
+        return cls(**kwargs)
+
+    def __post_init__(self):
+        self.address_label = self.register_address()
+        self.read_spec = ReadSpec(
+            self.address, self.register_type, self.value_type, self.size
         )
 
     def register_address(self) -> str:
@@ -184,7 +200,7 @@ class RegisterConfig:
         return self.mock
 
 
-@dataclass
+@dataclass(slots=True)
 class PLCConfig:
     """
     Configuration for the PLC.
@@ -194,20 +210,44 @@ class PLCConfig:
     port: int
     endianness: PLCEndianness
     word_order: PLCEndianness
+    max_gap: int
+    max_registers_per_request: int
 
     @classmethod
-    def from_dict(cls, endianness: str, word_order: str, **kwargs) -> "PLCConfig":
+    def from_dict(cls, **kwargs) -> "PLCConfig":
         """
-        Create a PLCConfig from a dictionary.
+        Create a PLCConfig from a validated dictionary.
         """
-        return cls(
-            endianness=PLCEndianness[endianness.upper()],
-            word_order=PLCEndianness[word_order.upper()],
-            **kwargs,
-        )
+        return cls(**kwargs)
+
 
+_TIMESPAN_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*", re.IGNORECASE)
+_TIMESPAN_UNITS = {
+    **dict.fromkeys(("ms", "millisecond", "milliseconds"), 1e-3),
+    **dict.fromkeys(("", "s", "sec", "secs", "second", "seconds"), 1),
+    **dict.fromkeys(("m", "min", "mins", "minute", "minutes"), 60),
+    **dict.fromkeys(("h", "hour", "hours"), 3600),
+    **dict.fromkeys(("d", "day", "days"), 86400),
+    **dict.fromkeys(("w", "week", "weeks"), 604800),
+}
+
+
+def parse_timespan(timespan: str) -> float:
+    """
+    Parse a timespan such as `30s`, `500ms` or `5m` into a number of seconds.
 
-@dataclass
+    A number without a unit is taken as seconds.
+
+    :raises ConfigError: If the timespan can not be parsed.
+    """
+    match = _TIMESPAN_PATTERN.fullmatch(timespan)
+    if match is None or match.group(2).lower() not in _TIMESPAN_UNITS:
+        raise ConfigError(f"Invalid timespan: {timespan!r}")
+
+    return float(match.group(1)) * _TIMESPAN_UNITS[match.group(2).lower()]
+
+
+@dataclass(slots=True)
 class ExporterConfig:
     """
     Configuration for the Prometheus exporter.
@@ -218,17 +258,11 @@ class ExporterConfig:
     log_level: LogLevel
 
     @classmethod
-    def from_dict(
-        cls, scrape_interval: str, log_level: str, **kwargs
-    ) -> "ExporterConfig":
+    def from_dict(cls, scrape_interval: str, **kwargs) -> "ExporterConfig":
         """
-        Create an ExporterConfig from a dictionary.
+        Create an ExporterConfig from a validated dictionary.
         """
-        return cls(
-            scrape_interval=humanfriendly.parse_timespan(scrape_interval),
-            log_level=LogLevel[log_level.upper()],
-            **kwargs,
-        )
+        return cls(scrape_interval=parse_timespan(scrape_interval), **kwargs)
 
 
 def load_config(config_path: str):
@@ -236,4 +270,4 @@ def load_config(config_path: str):
     Loads and validates the configuration from a YAML file.
     """
     with open(config_path, "r", encoding="utf-8") as f:
-        return PLC_EXPORTER_SCHEMA.validate(yaml.safe_load(f))
+        return PLC_EXPORTER_SCHEMA.validate(yaml.load(f, Loader=_YAMLLoader))
@@ -6,9 +6,15 @@ INFO_METRIC_NAME = "info"
 CONNECTION_METRIC_NAME = "connection_up"
 READ_LATENCY_METRIC_NAME = "read_time_seconds"
 ERROR_FREQUENCY_METRIC_NAME = "error_count"
+MOCK_READ_LATENCY = 0.125
 DEFAULT_SCRAPE_INTERVAL = "30s"
 DEFAULT_PORT = 9075
 DEFAULT_LOG_LEVEL = "info"
 DEFAULT_NAMESPACE = "plc"
 DEFAULT_IDENTIFER = "master"
 DEFAULT_METRIC_LAYOUT = "dynamic"
+RESERVED_LABEL_NAMES = frozenset(
+    {"start_address", "value_type", "register_type", "name", "index"}
+)
+DEFAULT_MAX_GAP = 0
+DEFAULT_MAX_REGISTERS_PER_REQUEST = 125
@@ -3,9 +3,10 @@ PLC Prometheus Exporter
 """
 
 import asyncio
-import time
+import logging
 import argparse
-import math
+from itertools import chain
+from typing import Callable
 
 from prometheus_client import start_http_server, Gauge, Counter, Histogram
 from logger import create_logger, set_level
@@ -15,14 +16,14 @@ from constants import (
     CONNECTION_METRIC_NAME,
     ERROR_FREQUENCY_METRIC_NAME,
     READ_LATENCY_METRIC_NAME,
+    MOCK_READ_LATENCY,
 )
 from plc_reader import (
     PLCReader,
-    PLCReadError,
+    PLCReadException,
     PLCReadConnectionError,
     PLCRegisterType,
     PLCValueType,
-    RegisterAddress,
 )
 
 prometheus_metrics: dict[str, Gauge] = {}
@@ -79,31 +80,31 @@ def __get_metric_description(
 def __get_metric_labels(
     register_config: RegisterConfig,
     metric_layout: MetricLayout,
-    address: int,
+    start_address: str,
     value_type: str,
     static_labels: dict,
     index: int | None = None,
 ) -> dict:
     """
     Get the default label set for the metric.
+
+    The order of the labels is the order of the metric label names, so the
+    values can be passed positionally to `labels()`.
     """
-    extra = {"index": index}
+    labels = {
+        "start_address": start_address,
+        "value_type": value_type,
+        **static_labels,
+    }
 
     if metric_layout == MetricLayout.STATIC:
-        extra = {
-            "register_type": register_config.register_type.value,
-            **extra,
-        }
+        labels["register_type"] = register_config.register_type.value
 
     if metric_layout == MetricLayout.DYNAMIC:
-        extra = {"name": register_config.name, **extra}
+        labels["name"] = register_config.name
 
-    return {
-        "start_address": str(RegisterAddress(address)),
-        "value_type": value_type,
-        **static_labels,
-        **extra,
-    }
+    labels["index"] = index
+    return labels
 
 
 def __char_metric(
@@ -118,25 +119,20 @@ def __char_metric(
 
     The value is converted into it's numeric ASCII representation.
     """
-    name = __get_metric_name(register_config, metric_layout)
-    description = __get_metric_description(register_config, metric_layout)
+    if register_config.gauge_child is not None:
+        register_config.gauge_child.set(ord(value))
+        return
+
     labels = __get_metric_labels(
         register_config=register_config,
         metric_layout=metric_layout,
-        address=register_config.address,
+        start_address=register_config.address_label,
         value_type="ascii",
         static_labels=static_labels,
     )
-
-    if prometheus_metrics.get(name) is None:
-        prometheus_metrics[name] = Gauge(
-            name=name,
-            documentation=description,
-            namespace=namespace,
-            labelnames=list(labels.keys()),
-        )
-
-    prometheus_metrics[name].labels(**labels).set(ord(value))
+    gauge = prometheus_metrics[register_config.metric_name]
+    register_config.gauge_child = gauge.labels(*labels.values())
+    register_config.gauge_child.set(ord(value))
 
 
 def __string_metric(
@@ -154,32 +150,28 @@ def __string_metric(
 
     Each character is converted into its numeric ASCII representation.
     """
-    description = __get_metric_description(register_config, metric_layout)
-    register_count = math.ceil(len(value) / 2)
-    register_addresses = [register_config.address + i for i in range(register_count)]
-
-    for i, char in enumerate(value):
-        char_value = ord(char)
-        address = register_addresses[i // 2]
+    if not value:
+        return
 
-        name = __get_metric_name(register_config, metric_layout)
-        labels = __get_metric_labels(
-            register_config=register_config,
-            metric_layout=metric_layout,
-            address=address,
-            value_type="ascii",
-            static_labels=static_labels,
-            index=i,
-        )
+    register_count = (len(value) + 1) >> 1
+    start_addresses = [
+        f"0x{register_config.address + i:04x}" for i in range(register_count)
+    ]
+    labels = __get_metric_labels(
+        register_config=register_config,
+        metric_layout=metric_layout,
+        start_address=register_config.address_label,
+        value_type="ascii",
+        static_labels=static_labels,
+    )
+    gauge = prometheus_metrics[register_config.metric_name]
 
-        if prometheus_metrics.get(name) is None:
-            prometheus_metrics[name] = Gauge(
-                name=name,
-                documentation=description,
-                namespace=namespace,
-                labelnames=list(labels.keys()),
-            )
-        prometheus_metrics[name].labels(**labels).set(char_value)
+    # Only the start address (first) and index (last) differ between characters
+    label_values = list(labels.values())
+    for i, char in enumerate(value):
+        label_values[0] = start_addresses[i // 2]
+        label_values[-1] = i
+        gauge.labels(*label_values).set(ord(char))
 
 
 def __bool_metric(
@@ -211,25 +203,54 @@ def __numeric_metric(
     """
     Create a metric from a numeric value stored in one or two (up to 32 bits) registers.
     """
-    description = __get_metric_description(register_config, metric_layout)
-    name = __get_metric_name(register_config, metric_layout)
+    if register_config.gauge_child is not None:
+        register_config.gauge_child.set(value)
+        return
+
     labels = __get_metric_labels(
         register_config=register_config,
         metric_layout=metric_layout,
-        address=register_config.address,
+        start_address=register_config.address_label,
         value_type=register_config.value_type.value,
         static_labels=static_labels,
     )
+    gauge = prometheus_metrics[register_config.metric_name]
+    register_config.gauge_child = gauge.labels(*labels.values())
+    register_config.gauge_child.set(value)
 
-    if prometheus_metrics.get(name) is None:
-        prometheus_metrics[name] = Gauge(
-            name=name,
-            documentation=description,
-            namespace=namespace,
-            labelnames=list(labels.keys()),
-        )
 
-    prometheus_metrics[name].labels(**labels).set(value)
+def register_metric(
+    register_config: RegisterConfig,
+    metric_layout: MetricLayout,
+    namespace: str,
+    static_labels: dict,
+):
+    """
+    Create the gauge holding the value of a register.
+
+    Registers sharing a metric name (e.g. all coils in the dynamic layout) share
+    a single gauge.
+    """
+    register_config.metric_name = __get_metric_name(register_config, metric_layout)
+    register_config.metric_description = __get_metric_description(
+        register_config, metric_layout
+    )
+    if register_config.metric_name in prometheus_metrics:
+        return
+
+    labels = __get_metric_labels(
+        register_config=register_config,
+        metric_layout=metric_layout,
+        start_address=register_config.address_label,
+        value_type=register_config.value_type.value,
+        static_labels=static_labels,
+    )
+    prometheus_metrics[register_config.metric_name] = Gauge(
+        name=register_config.metric_name,
+        documentation=register_config.metric_description,
+        namespace=namespace,
+        labelnames=list(labels.keys()),
+    )
 
 
 def info_metric(namespace: str, static_labels: dict):
@@ -245,7 +266,7 @@ def info_metric(namespace: str, static_labels: dict):
             labelnames=list(static_labels.keys()),
         )
 
-    prometheus_metrics[INFO_METRIC_NAME].labels(**static_labels)
+    prometheus_metrics[INFO_METRIC_NAME].labels(*static_labels.values())
 
 
 def connection_metric(namespace: str, static_labels: dict):
@@ -261,7 +282,7 @@ def connection_metric(namespace: str, static_labels: dict):
             labelnames=list(static_labels.keys()),
         )
 
-    prometheus_metrics[CONNECTION_METRIC_NAME].labels(**static_labels)
+    prometheus_metrics[CONNECTION_METRIC_NAME].labels(*static_labels.values())
 
 
 def set_connection_metric(
@@ -271,11 +292,25 @@ def set_connection_metric(
     """
     Set the connection status of the PLC.
     """
-    prometheus_metrics[CONNECTION_METRIC_NAME].labels(**static_labels).set(
+    prometheus_metrics[CONNECTION_METRIC_NAME].labels(*static_labels.values()).set(
         int(connected)
     )
 
 
+def __get_register_label_names(static_labels: dict) -> list[str]:
+    """
+    Get the label names of the per register latency and error metrics.
+    """
+    return [
+        "start_address",
+        "value_type",
+        "register_type",
+        *static_labels,
+        "name",
+        "index",
+    ]
+
+
 def latency_metric(namespace: str, static_labels: dict):
     """
     Create a metric to track the read latency on a register.
@@ -285,10 +320,7 @@ def latency_metric(namespace: str, static_labels: dict):
             name=READ_LATENCY_METRIC_NAME,
             documentation="Read latency in milliseconds on a register",
             namespace=namespace,
-            labelnames=set(
-                ["name", "value_type", "start_address", "index", "register_type"]
-                + list(static_labels.keys())
-            ),
+            labelnames=__get_register_label_names(static_labels),
         )
 
 
@@ -300,17 +332,22 @@ def set_latency_metric(
     """
     Set the latency value in milliseconds on the register that was read.
     """
-    labels = __get_metric_labels(
-        register_config=register_config,
-        metric_layout=MetricLayout.DYNAMIC,
-        address=register_config.address,
-        value_type=register_config.value_type.value,
-        static_labels={
-            "register_type": register_config.register_type.value,
-            **static_labels,
-        },
-    )
-    prometheus_metrics[READ_LATENCY_METRIC_NAME].labels(**labels).observe(latency)
+    child = register_config.latency_child
+    if child is None:
+        labels = __get_metric_labels(
+            register_config=register_config,
+            metric_layout=MetricLayout.DYNAMIC,
+            start_address=register_config.address_label,
+            value_type=register_config.value_type.value,
+            static_labels={
+                "register_type": register_config.register_type.value,
+                **static_labels,
+            },
+        )
+        child = prometheus_metrics[READ_LATENCY_METRIC_NAME].labels(*labels.values())
+        register_config.latency_child = child
+
+    child.observe(latency)
 
 
 def error_metric(namespace: str, static_labels: dict):
@@ -322,10 +359,7 @@ def error_metric(namespace: str, static_labels: dict):
             name=ERROR_FREQUENCY_METRIC_NAME,
             documentation="Number of errors while reading from the register",
             namespace=namespace,
-            labelnames=set(
-                ["name", "value_type", "start_address", "register_type", "index"]
-                + list(static_labels.keys())
-            ),
+            labelnames=__get_register_label_names(static_labels),
         )
 
 
@@ -337,20 +371,40 @@ def set_error_metric(
     """
     Increment the error metric.
     """
-    labels = __get_metric_labels(
-        register_config=register_config,
-        metric_layout=MetricLayout.DYNAMIC,
-        address=register_config.address,
-        value_type=register_config.value_type.value,
-        static_labels={
-            "register_type": register_config.register_type.value,
-            **static_labels,
-        },
-    )
-    if init is not None:
-        prometheus_metrics[ERROR_FREQUENCY_METRIC_NAME].labels(**labels).inc(0)
-    else:
-        prometheus_metrics[ERROR_FREQUENCY_METRIC_NAME].labels(**labels).inc()
+    child = register_config.error_child
+    if child is None:
+        labels = __get_metric_labels(
+            register_config=register_config,
+            metric_layout=MetricLayout.DYNAMIC,
+            start_address=register_config.address_label,
+            value_type=register_config.value_type.value,
+            static_labels={
+                "register_type": register_config.register_type.value,
+                **static_labels,
+            },
+        )
+        child = prometheus_metrics[ERROR_FREQUENCY_METRIC_NAME].labels(*labels.values())
+        register_config.error_child = child
+
+    child.inc(0 if init else 1)
+
+
+type_to_metric: dict[PLCValueType, Callable] = {
+    PLCValueType.UINT8: __numeric_metric,
+    PLCValueType.UINT16: __numeric_metric,
+    PLCValueType.UINT32: __numeric_metric,
+    PLCValueType.UINT64: __numeric_metric,
+    PLCValueType.INT8: __numeric_metric,
+    PLCValueType.INT16: __numeric_metric,
+    PLCValueType.INT32: __numeric_metric,
+    PLCValueType.INT64: __numeric_metric,
+    PLCValueType.FLOAT16: __numeric_metric,
+    PLCValueType.FLOAT32: __numeric_metric,
+    PLCValueType.FLOAT64: __numeric_metric,
+    PLCValueType.CHAR: __char_metric,
+    PLCValueType.STRING: __string_metric,
+    PLCValueType.BOOL: __bool_metric,
+}
 
 
 def metric(
@@ -363,23 +417,6 @@ def metric(
     """
     Create a metric based on the data type.
     """
-    type_to_metric = {
-        PLCValueType.UINT8: __numeric_metric,
-        PLCValueType.UINT16: __numeric_metric,
-        PLCValueType.UINT32: __numeric_metric,
-        PLCValueType.UINT64: __numeric_metric,
-        PLCValueType.INT8: __numeric_metric,
-        PLCValueType.INT16: __numeric_metric,
-        PLCValueType.INT32: __numeric_metric,
-        PLCValueType.INT64: __numeric_metric,
-        PLCValueType.FLOAT16: __numeric_metric,
-        PLCValueType.FLOAT32: __numeric_metric,
-        PLCValueType.FLOAT64: __numeric_metric,
-        PLCValueType.CHAR: __char_metric,
-        PLCValueType.STRING: __string_metric,
-        PLCValueType.BOOL: __bool_metric,
-    }
-
     type_to_metric[register_config.value_type](
         register_config=register_config,
         value=value,
@@ -400,51 +437,76 @@ async def update_metrics(
     """
     Update the Prometheus metrics with the values read from the PLC.
     """
-    if plc is not None:
+    # The connection is kept open between updates and only reopened once dropped
+    if plc is not None and not plc.connected:
         try:
             await plc.connect()
         except PLCReadConnectionError as exc:
             set_connection_metric(connected=False, static_labels=labels)
-            logger.error(exc.message)
+            logger.error("%s", exc.message)
             return
 
     set_connection_metric(connected=True, static_labels=labels)
 
-    for r in registers:
-        try:
-            if mock:
-                value = r.mock_value()
-                latency = 0.125
-            else:
-                start_time = time.perf_counter()
-                value = await plc.read(r.address, r.register_type, r.value_type, r.size)
-                latency = time.perf_counter() - start_time  # seconds
-
+    if mock:
+        # Mock values never change and are exported once by `set_mock_metrics`
+        for r in registers:
             set_latency_metric(
                 register_config=r,
                 static_labels=labels,
-                latency=latency,
+                latency=MOCK_READ_LATENCY,
             )
-            metric(
-                register_config=r,
-                value=value,
-                metric_layout=metric_layout,
-                namespace=namespace,
-                static_labels=labels,
-            )
-        except PLCReadError as exc:
+        return
+
+    values, latencies = await plc.read_many_timed([r.read_spec for r in registers])
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for r, value, latency in zip(registers, values, latencies):
+        if isinstance(value, PLCReadException):
             logger.error(
                 "Unable to read %s with name %s: %s",
-                str(RegisterAddress(r.address)),
+                r.address_label,
                 r.name,
-                exc,
+                value,
             )
-            logger.debug(exc, exc_info=True)
+            if debug:
+                logger.debug("%s", value, exc_info=value)
             set_error_metric(register_config=r, static_labels=labels)
             continue
 
-    if plc is not None:
-        plc.close()
+        set_latency_metric(
+            register_config=r,
+            static_labels=labels,
+            latency=latency,
+        )
+        metric(
+            register_config=r,
+            value=value,
+            metric_layout=metric_layout,
+            namespace=namespace,
+            static_labels=labels,
+        )
+
+
+def set_mock_metrics(
+    metric_layout: MetricLayout,
+    registers: list[RegisterConfig],
+    labels: dict,
+    namespace: str,
+):
+    """
+    Export the mock values of the registers.
+
+    The mock values are static, so they only have to be set once.
+    """
+    for r in registers:
+        metric(
+            register_config=r,
+            value=r.mock_value(),
+            metric_layout=metric_layout,
+            namespace=namespace,
+            static_labels=labels,
+        )
 
 
 async def start_exporter(port: int, scrape_interval: int, config: dict):
@@ -466,17 +528,19 @@ async def start_exporter(port: int, scrape_interval: int, config: dict):
             port=plc_config.port,
             endianness=plc_config.endianness,
             word_order=plc_config.word_order,
+            max_gap=plc_config.max_gap,
+            max_registers_per_request=plc_config.max_registers_per_request,
         )
 
     static_labels = {
         **{"plc": config["identifier"]},
         **config["static_labels"],
     }
-    all_registers = (
-        config["coils"]
-        + config["discrete_inputs"]
-        + config["input_registers"]
-        + config["holding_registers"]
+    all_registers = chain(
+        config["coils"],
+        config["discrete_inputs"],
+        config["input_registers"],
+        config["holding_registers"],
     )
     register_configs = [
         RegisterConfig.from_dict(**register) for register in all_registers
@@ -488,24 +552,70 @@ async def start_exporter(port: int, scrape_interval: int, config: dict):
     error_metric(namespace=namespace, static_labels=static_labels)
     connection_metric(namespace=namespace, static_labels=static_labels)
 
+    metric_layout = config["metric_layout"]
+
     for register in register_configs:
+        register_metric(
+            register_config=register,
+            metric_layout=metric_layout,
+            namespace=namespace,
+            static_labels=static_labels,
+        )
         set_error_metric(
             register_config=register, static_labels=static_labels, init=True
         )
 
-    metric_layout = MetricLayout(config["metric_layout"])
-
-    while True:
-        logger.debug("Updating metrics")
-        await update_metrics(
-            plc=plc,
-            mock=mock,
+    if mock:
+        set_mock_metrics(
             metric_layout=metric_layout,
             registers=register_configs,
             labels=static_labels,
             namespace=namespace,
         )
-        await asyncio.sleep(scrape_interval)
+
+    # Schedule updates on a fixed grid of the event loop's monotonic clock so the
+    # time spent updating does not add to the interval between updates.
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+    update: asyncio.Task | None = None
+    timer: asyncio.Handle
+
+    def on_update_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() and not stopped.done():
+            stopped.set_exception(task.exception())
+
+    def tick(deadline: float):
+        nonlocal update, timer
+        if update is not None and not update.done():
+            logger.warning("Updating metrics overran the scrape interval, skipping")
+        else:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Updating metrics")
+            update = loop.create_task(
+                update_metrics(
+                    plc=plc,
+                    mock=mock,
+                    metric_layout=metric_layout,
+                    registers=register_configs,
+                    labels=static_labels,
+                    namespace=namespace,
+                )
+            )
+            update.add_done_callback(on_update_done)
+
+        # Do not try to catch up on deadlines missed while the loop was busy
+        deadline = max(deadline + scrape_interval, loop.time())
+        timer = loop.call_at(deadline, tick, deadline)
+
+    timer = loop.call_soon(tick, loop.time())
+    try:
+        await stopped
+    finally:
+        timer.cancel()
+        if update is not None:
+            update.cancel()
+        if plc is not None:
+            plc.close()
 
 
 def run():
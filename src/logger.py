@@ -18,14 +18,9 @@ class LogLevel(Enum):
     CRITICAL = logging.CRITICAL
 
 
-class LowercaseLevelFormatter(logging.Formatter):
-    """
-    Converts the default log level to lowercase.
-    """
-
-    def format(self, record):
-        record.levelname = record.levelname.lower()
-        return super().format(record)
+# Register the level names in lowercase once instead of converting per record
+for level in LogLevel:
+    logging.addLevelName(level.value, level.name.lower())
 
 
 def create_logger(name: str, log_level: int = logging.DEBUG) -> logging.Logger:
@@ -34,8 +29,10 @@ def create_logger(name: str, log_level: int = logging.DEBUG) -> logging.Logger:
     """
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
+    # The logger has its own handler, no need to walk up to the root logger
+    logger.propagate = False
     ch = logging.StreamHandler()
-    formatter = LowercaseLevelFormatter(
+    formatter = logging.Formatter(
         'timestamp=%(asctime)s level=%(levelname)s message="%(message)s"',
         datefmt="%Y-%m-%dT%H:%M:%S",
     )
@@ -2,9 +2,15 @@
 This module provides a class to read values from a modbus TCP PLC given the configuration.
 """
 
-from typing import Callable
+import asyncio
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
 from enum import Enum
-from math import ceil
+from struct import Struct, calcsize
 from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ModbusException
 from pymodbus.payload import BinaryPayloadDecoder as BPD
@@ -52,10 +58,13 @@ class PLCEndianness(Enum):
         """
         Convert the endianness to a pymodbus endian.
         """
-        return {
-            PLCEndianness.BIG: ModbusEndian.BIG,
-            PLCEndianness.LITTLE: ModbusEndian.LITTLE,
-        }[self]
+        return _MODBUS_ENDIAN[self]
+
+
+_MODBUS_ENDIAN = {
+    PLCEndianness.BIG: ModbusEndian.BIG,
+    PLCEndianness.LITTLE: ModbusEndian.LITTLE,
+}
 
 
 class PLCRegisterType(Enum):
@@ -68,6 +77,13 @@ class PLCRegisterType(Enum):
     INPUT_REGISTERS = "input_registers"
     HOLDING_REGISTERS = "holding_registers"
 
+    @property
+    def default_vtype(self) -> "PLCValueType | None":
+        """
+        The data type the register always holds, or `None` if it holds any data type.
+        """
+        return self._default_vtype
+
 
 class PLCValueType(Enum):
     """
@@ -89,47 +105,143 @@ class PLCValueType(Enum):
     STRING = "string"
     BOOL = "bool"
 
+    @property
+    def size_bytes(self) -> int | None:
+        """
+        The size of the data type in bytes, or `None` if it has a variable size.
+        """
+        return self._size_bytes
+
     def max_value(self):
         """
         The maximum value that can be represented by the data type.
         """
-        return {
-            PLCValueType.UINT8: 2**8 - 1,
-            PLCValueType.UINT16: 2**16 - 1,
-            PLCValueType.UINT32: 2**32 - 1,
-            PLCValueType.UINT64: 2**64 - 1,
-            PLCValueType.INT8: 2**7 - 1,
-            PLCValueType.INT16: 2**15 - 1,
-            PLCValueType.INT32: 2**31 - 1,
-            PLCValueType.INT64: 2**63 - 1,
-            PLCValueType.FLOAT16: 2**16 - 1,
-            PLCValueType.FLOAT32: 2**32 - 1,
-            PLCValueType.FLOAT64: 2**64 - 1,
-            PLCValueType.CHAR: 2**8 - 1,
-            PLCValueType.STRING: None,
-            PLCValueType.BOOL: 1,
-        }[self]
+        return _MAX_VALUES[self]
 
     def min_value(self):
         """
         The minimum value that can be represented by the data type.
         """
-        return {
-            PLCValueType.UINT8: 0,
-            PLCValueType.UINT16: 0,
-            PLCValueType.UINT32: 0,
-            PLCValueType.UINT64: 0,
-            PLCValueType.INT8: -(2**7),
-            PLCValueType.INT16: -(2**15),
-            PLCValueType.INT32: -(2**31),
-            PLCValueType.INT64: -(2**63),
-            PLCValueType.FLOAT16: -(2**16),
-            PLCValueType.FLOAT32: -(2**32),
-            PLCValueType.FLOAT64: -(2**64),
-            PLCValueType.CHAR: 0,
-            PLCValueType.STRING: None,
-            PLCValueType.BOOL: 0,
-        }[self]
+        return _MIN_VALUES[self]
+
+
+_MAX_VALUES = {
+    PLCValueType.UINT8: 2**8 - 1,
+    PLCValueType.UINT16: 2**16 - 1,
+    PLCValueType.UINT32: 2**32 - 1,
+    PLCValueType.UINT64: 2**64 - 1,
+    PLCValueType.INT8: 2**7 - 1,
+    PLCValueType.INT16: 2**15 - 1,
+    PLCValueType.INT32: 2**31 - 1,
+    PLCValueType.INT64: 2**63 - 1,
+    PLCValueType.FLOAT16: 2**16 - 1,
+    PLCValueType.FLOAT32: 2**32 - 1,
+    PLCValueType.FLOAT64: 2**64 - 1,
+    PLCValueType.CHAR: 2**8 - 1,
+    PLCValueType.STRING: None,
+    PLCValueType.BOOL: 1,
+}
+
+_MIN_VALUES = {
+    PLCValueType.UINT8: 0,
+    PLCValueType.UINT16: 0,
+    PLCValueType.UINT32: 0,
+    PLCValueType.UINT64: 0,
+    PLCValueType.INT8: -(2**7),
+    PLCValueType.INT16: -(2**15),
+    PLCValueType.INT32: -(2**31),
+    PLCValueType.INT64: -(2**63),
+    PLCValueType.FLOAT16: -(2**16),
+    PLCValueType.FLOAT32: -(2**32),
+    PLCValueType.FLOAT64: -(2**64),
+    PLCValueType.CHAR: 0,
+    PLCValueType.STRING: None,
+    PLCValueType.BOOL: 0,
+}
+
+_SIZE_BYTES = {
+    PLCValueType.UINT8: 1,
+    PLCValueType.UINT16: 2,
+    PLCValueType.UINT32: 4,
+    PLCValueType.UINT64: 8,
+    PLCValueType.INT8: 1,
+    PLCValueType.INT16: 2,
+    PLCValueType.INT32: 4,
+    PLCValueType.INT64: 8,
+    PLCValueType.FLOAT16: 2,
+    PLCValueType.FLOAT32: 4,
+    PLCValueType.FLOAT64: 8,
+    PLCValueType.CHAR: 1,
+    PLCValueType.STRING: None,
+    PLCValueType.BOOL: 1,
+}
+
+_DEFAULT_VTYPES = {
+    PLCRegisterType.COILS: PLCValueType.BOOL,
+    PLCRegisterType.DISCRETE_INPUTS: PLCValueType.BOOL,
+    PLCRegisterType.INPUT_REGISTERS: None,
+    PLCRegisterType.HOLDING_REGISTERS: None,
+}
+
+# Attached to the enum members so the hot path needs no dict lookups
+for _value_type, _size in _SIZE_BYTES.items():
+    _value_type._size_bytes = _size
+for _register_type, _value_type in _DEFAULT_VTYPES.items():
+    _register_type._default_vtype = _value_type
+
+# Ordinals index the per-reader lookup tables, which are tuples in enum order
+for _enum in (PLCValueType, PLCRegisterType):
+    for _ordinal, _member in enumerate(_enum):
+        _member._ordinal = _ordinal
+
+
+_BYTE_ORDER_CHAR = {
+    PLCEndianness.BIG: ">",
+    PLCEndianness.LITTLE: "<",
+}
+
+# The struct format character of each fixed size data type
+_STRUCT_FORMATS: dict[PLCValueType, str] = {
+    PLCValueType.UINT8: "B",
+    PLCValueType.UINT16: "H",
+    PLCValueType.UINT32: "I",
+    PLCValueType.UINT64: "Q",
+    PLCValueType.INT8: "b",
+    PLCValueType.INT16: "h",
+    PLCValueType.INT32: "i",
+    PLCValueType.INT64: "q",
+    PLCValueType.FLOAT16: "e",
+    PLCValueType.FLOAT32: "f",
+    PLCValueType.FLOAT64: "d",
+    PLCValueType.CHAR: "c",
+}
+
+
+def _build_structs() -> dict[tuple[PLCValueType, PLCEndianness, PLCEndianness], Struct]:
+    """
+    Build the struct decoding each fixed size data type for every byte and word order.
+
+    The registers are packed with their bytes swapped when the byte order differs from
+    the word order, after which every multi-byte value decodes in the word order.
+    Single byte values are taken from the high byte of the register. Orders sharing a
+    layout share one compiled struct.
+    """
+    compiled: dict[str, Struct] = {}
+    structs = {}
+    for data_type, fmt in _STRUCT_FORMATS.items():
+        for byteorder in PLCEndianness:
+            for wordorder in PLCEndianness:
+                if calcsize(fmt) == 1:
+                    layout = f">x{fmt}" if byteorder is not wordorder else f">{fmt}"
+                else:
+                    layout = _BYTE_ORDER_CHAR[wordorder] + fmt
+                if layout not in compiled:
+                    compiled[layout] = Struct(layout)
+                structs[(data_type, byteorder, wordorder)] = compiled[layout]
+    return structs
+
+
+_STRUCTS = _build_structs()
 
 
 class RegisterAddress:
@@ -154,6 +266,33 @@ class RegisterAddress:
         return f"RegisterAddress(address={self._address})"
 
 
+@dataclass(frozen=True, slots=True)
+class ReadSpec:
+    """
+    A single value to read from the PLC, see `PLCReader.read` for the fields.
+    """
+
+    address: int
+    register_type: PLCRegisterType
+    data_type: PLCValueType = PLCValueType.UINT16
+    size: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BlockField:
+    """
+    A value to decode from a block read with `PLCReader.read_block`.
+
+    `offset` is the number of registers (or bits) from the start of the block, the
+    other fields are those of `PLCReader.read`.
+    """
+
+    offset: int
+    data_type: PLCValueType
+    name: str
+    size: int = 1
+
+
 class PLCReader:
     """
     Reads values from a modbus TCP PLC given the configuration.
@@ -187,48 +326,32 @@ class PLCReader:
         data_type=PLCValueType.STRING,
         size=10,
     )
+    values = await plc.read_many([
+        ReadSpec(address=0, register_type=PLCRegisterType.COILS),
+        ReadSpec(
+            address=0,
+            register_type=PLCRegisterType.HOLDING_REGISTERS,
+            data_type=PLCValueType.FLOAT32,
+        ),
+    ])
+    block = await plc.read_block(
+        start=0,
+        count=4,
+        register_type=PLCRegisterType.HOLDING_REGISTERS,
+        fields=[
+            BlockField(offset=0, data_type=PLCValueType.UINT16, name="status"),
+            BlockField(offset=2, data_type=PLCValueType.FLOAT32, name="speed"),
+        ],
+    )
     plc.close()
     ```
     """
 
-    REGISTER_VTYPE = {
-        PLCRegisterType.COILS: PLCValueType.BOOL,
-        PLCRegisterType.DISCRETE_INPUTS: PLCValueType.BOOL,
-        PLCRegisterType.INPUT_REGISTERS: None,
-        PLCRegisterType.HOLDING_REGISTERS: None,
-    }
-    VTYPE_SIZE_BYTES = {
-        PLCValueType.UINT8: 1,
-        PLCValueType.UINT16: 2,
-        PLCValueType.UINT32: 4,
-        PLCValueType.UINT64: 8,
-        PLCValueType.INT8: 1,
-        PLCValueType.INT16: 2,
-        PLCValueType.INT32: 4,
-        PLCValueType.INT64: 8,
-        PLCValueType.FLOAT16: 2,
-        PLCValueType.FLOAT32: 4,
-        PLCValueType.FLOAT64: 8,
-        PLCValueType.CHAR: 1,
-        PLCValueType.STRING: None,
-        PLCValueType.BOOL: 1,
-    }
-
-    REGISTER_DECODERS: dict[
-        PLCRegisterType, Callable[[ModbusResponse, PLCEndianness, PLCEndianness], BPD]
-    ] = {
-        PLCRegisterType.COILS: lambda r, e, w: BPD.fromCoils(
-            coils=r.bits, byteorder=PLCEndianness.BIG.value, _wordorder=w
-        ),
-        PLCRegisterType.DISCRETE_INPUTS: lambda r, e, w: BPD.fromCoils(
-            coils=r.bits, byteorder=PLCEndianness.BIG.value, _wordorder=w
-        ),
-        PLCRegisterType.INPUT_REGISTERS: lambda r, e, w: BPD.fromRegisters(
-            registers=r.registers, byteorder=e, wordorder=w
-        ),
-        PLCRegisterType.HOLDING_REGISTERS: lambda r, e, w: BPD.fromRegisters(
-            registers=r.registers, byteorder=e, wordorder=w
-        ),
+    MAX_READ_COUNT = {
+        PLCRegisterType.COILS: 2000,
+        PLCRegisterType.DISCRETE_INPUTS: 2000,
+        PLCRegisterType.INPUT_REGISTERS: 125,
+        PLCRegisterType.HOLDING_REGISTERS: 125,
     }
 
     def __init__(
@@ -237,18 +360,64 @@ class PLCReader:
         port: int = 502,
         endianness: PLCEndianness = PLCEndianness.BIG,
         word_order: PLCEndianness = PLCEndianness.BIG,
+        max_gap: int = 0,
+        max_registers_per_request: int = 125,
+        cache_ttl: float = 0,
+        cache_size: int = 1024,
     ):
+        """
+        :param max_gap: The number of unused addresses that may be read to join two
+            values into a single modbus request.
+        :param max_registers_per_request: The maximum number of input or holding
+            registers to read with a single modbus request.
+        :param cache_ttl: The number of seconds a value that was read is reused for
+            instead of reading it again. `0` disables the cache.
+        :param cache_size: The maximum number of values kept in the cache.
+        """
         self._host = host
         self._port = port
         self._word_order = word_order
         self._endianness = endianness
+        self._mb_endian = endianness.as_modbus_endian()
+        self._mb_word = word_order.as_modbus_endian()
+        # The run payload holds big-endian registers when the byte order matches the
+        # word order and little-endian registers otherwise (see `_build_structs`)
+        self._swap_payload = (endianness is word_order) == (sys.byteorder == "little")
+        # The bound unpack_from of each data type's struct, by data type ordinal
+        self._unpackers = tuple(
+            (
+                _STRUCTS[(data_type, endianness, word_order)].unpack_from
+                if data_type in _STRUCT_FORMATS
+                else None
+            )
+            for data_type in PLCValueType
+        )
+        self._max_gap = max_gap
+        self._max_read_count = tuple(
+            (
+                max_registers_per_request
+                if register_type.default_vtype is None
+                else PLCReader.MAX_READ_COUNT[register_type]
+            )
+            for register_type in PLCRegisterType
+        )
+        # The specs of the last read with their runs, as the same specs are
+        # usually read over and over
+        self.__schedule: tuple[tuple[ReadSpec, ...], list] = ((), [])
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        self.__cache: OrderedDict[ReadSpec, tuple[float, any]] = OrderedDict()
         self.__client = AsyncModbusTcpClient(host=host, port=port)
-        self.__readers = {
+        readers = {
             PLCRegisterType.COILS: self.__client.read_coils,
             PLCRegisterType.DISCRETE_INPUTS: self.__client.read_discrete_inputs,
             PLCRegisterType.INPUT_REGISTERS: self.__client.read_input_registers,
             PLCRegisterType.HOLDING_REGISTERS: self.__client.read_holding_registers,
         }
+        # The read function of each register type, by register type ordinal
+        self.__readers = tuple(
+            readers[register_type] for register_type in PLCRegisterType
+        )
 
     async def read(
         self,
@@ -268,61 +437,360 @@ class PLCReader:
         :raises PLCReadError: If the register could not be read.
         :raises PLCDecodeError: If the register could not be decoded.
         """
-        return await self.__read(
-            address=address,
-            read_fn=self.__readers[register_type],
-            register_type=register_type,
-            data_type=PLCReader.REGISTER_VTYPE[register_type] or data_type,
-            size=PLCReader.VTYPE_SIZE_BYTES[data_type] or size,
+        (value,) = await self.read_many(
+            [ReadSpec(address, register_type, data_type, size)]
         )
+        if isinstance(value, PLCReadException):
+            raise value
+        return value
 
-    async def __read(
+    def make_reader(
         self,
         address: int,
-        read_fn: callable,
         register_type: PLCRegisterType,
-        data_type: PLCValueType,
-        size: int,
-    ) -> int | str | bool:
-        try:
-            response = await read_fn(
-                address=address,
-                count=ceil(size / 2),
+        data_type: PLCValueType = PLCValueType.UINT16,
+        size: int = 1,
+    ) -> Callable[[], Awaitable[int | float | bytes | bool]]:
+        """
+        Build a function reading a single value from the PLC.
+
+        The read function, register count and data type are resolved once, so a value
+        that is read repeatedly skips them on every read.
+
+        :param address: See `read`.
+        :param register_type: See `read`.
+        :param data_type: See `read`.
+        :param size: See `read`.
+        :returns: A coroutine function returning the value, raising like `read`.
+        """
+        read_fn = self.__readers[register_type._ordinal]
+        data_type, size, count = self.__normalize(register_type, data_type, size)
+
+        if register_type.default_vtype is PLCValueType.BOOL:
+
+            async def read_bit() -> bool:
+                response = await self.__request(read_fn, address, count)
+                return response.bits[0]
+
+            return read_bit
+
+        if data_type is PLCValueType.STRING:
+
+            async def read_string() -> bytes:
+                response = await self.__request(read_fn, address, count)
+                decoder = self.__decoder(response.registers)
+                return self.__decode(None, decoder, 0, data_type, size)
+
+            return read_string
+
+        async def read_registers() -> int | float:
+            response = await self.__request(read_fn, address, count)
+            payload = self.__payload(response.registers)
+            return self.__decode(payload, None, 0, data_type, size)
+
+        return read_registers
+
+    async def read_many(self, specs: list[ReadSpec]) -> list:
+        """
+        Read multiple values from the PLC.
+
+        Values of the same register type that are at most `max_gap` addresses apart
+        are read with a single modbus request, up to `max_registers_per_request`
+        registers (or the protocol limit of 2000 coils or discrete inputs).
+
+        :param specs: The values to read.
+        :returns: The values in the order of `specs`. A value that could not be read
+            or decoded is returned as the `PLCReadException` raised for it.
+        """
+        return (await self.read_many_timed(specs))[0]
+
+    async def read_many_timed(self, specs: list[ReadSpec]) -> tuple[list, list[float]]:
+        """
+        Read multiple values from the PLC like `read_many`, timing the requests.
+
+        :param specs: The values to read.
+        :returns: The values as returned by `read_many`, and for each value the time in
+            seconds of the modbus request it was read with (`0` for cached values).
+        """
+        if not self._cache_ttl:
+            return await self.__read_many(specs)
+
+        now = time.monotonic()
+        results = [None] * len(specs)
+        latencies = [0.0] * len(specs)
+        missing = []
+        for index, spec in enumerate(specs):
+            cached = self.__cache.get(spec)
+            if cached is not None and now - cached[0] < self._cache_ttl:
+                self.__cache.move_to_end(spec)
+                results[index] = cached[1]
+            else:
+                missing.append(index)
+
+        if missing:
+            values, read_latencies = await self.__read_many(
+                [specs[index] for index in missing]
+            )
+            for index, value, latency in zip(missing, values, read_latencies):
+                results[index] = value
+                latencies[index] = latency
+                if not isinstance(value, PLCReadException):
+                    self.__cache_value(specs[index], now, value)
+
+        return results, latencies
+
+    def invalidate(self):
+        """
+        Drop all cached values, so the next reads go to the PLC.
+        """
+        self.__cache.clear()
+
+    def __cache_value(self, spec: ReadSpec, timestamp: float, value):
+        self.__cache[spec] = (timestamp, value)
+        self.__cache.move_to_end(spec)
+        if len(self.__cache) > self._cache_size:
+            self.__cache.popitem(last=False)
+
+    async def __read_many(self, specs: list[ReadSpec]) -> tuple[list, list[float]]:
+        results = [None] * len(specs)
+        latencies = [0.0] * len(specs)
+
+        key = tuple(specs)
+        if key != self.__schedule[0]:
+            self.__schedule = (key, self.__coalesce(specs))
+
+        for register_type, start, count, members in self.__schedule[1]:
+            read_fn = self.__readers[register_type._ordinal]
+            start_time = time.perf_counter()
+            try:
+                response = await self.__request(read_fn, start, count)
+            except PLCReadError as exc:
+                # An error response to a run can be caused by a single value, read
+                # the values on their own so only the rejected ones fail
+                if len(members) > 1 and not isinstance(exc.__cause__, ModbusException):
+                    await self.__read_members(
+                        register_type, read_fn, start, members, results, latencies
+                    )
+                    continue
+                for index, *_ in members:
+                    results[index] = exc
+                continue
+
+            latency = time.perf_counter() - start_time
+            for index, *_ in members:
+                latencies[index] = latency
+            self.__decode_run(register_type, response, members, results)
+
+        return results, latencies
+
+    async def __read_members(
+        self,
+        register_type: PLCRegisterType,
+        read_fn: Callable,
+        start: int,
+        members: list[tuple[int, int, PLCValueType, int]],
+        results: list,
+        latencies: list[float],
+    ):
+        """
+        Read the values of a run with a request each, into `results` and `latencies`.
+        """
+        for index, offset, data_type, size in members:
+            count = self.__normalize(register_type, data_type, size)[2]
+            start_time = time.perf_counter()
+            try:
+                response = await self.__request(read_fn, start + offset, count)
+            except PLCReadError as exc:
+                results[index] = exc
+                continue
+            latencies[index] = time.perf_counter() - start_time
+            self.__decode_run(
+                register_type, response, [(index, 0, data_type, size)], results
+            )
+
+    async def read_block(
+        self,
+        start: int,
+        count: int,
+        register_type: PLCRegisterType,
+        fields: list[BlockField],
+    ) -> dict[str, int | float | bytes | bool | PLCDecodeError]:
+        """
+        Read a block of registers with a single modbus request and decode fields from it.
+
+        Use `make_block_reader` to read the same block repeatedly.
+
+        :param start: The address of the first register of the block.
+        :param count: The number of registers (or bits) in the block.
+        :param register_type: The type of registers to read.
+        :param fields: The values to decode from the block.
+        :returns: The value of each field by name. A value that could not be decoded is
+            returned as the `PLCDecodeError` raised for it.
+        :raises ValueError: If a field does not fit in the block.
+        :raises PLCReadError: If the block could not be read.
+        """
+        return await self.make_block_reader(start, count, register_type, fields)()
+
+    def make_block_reader(
+        self,
+        start: int,
+        count: int,
+        register_type: PLCRegisterType,
+        fields: list[BlockField],
+    ) -> Callable[
+        [], Awaitable[dict[str, int | float | bytes | bool | PLCDecodeError]]
+    ]:
+        """
+        Build a function reading a block of registers, see `read_block`.
+
+        The fields are validated and resolved once, when the function is built.
+
+        :returns: A coroutine function returning the fields like `read_block`.
+        :raises ValueError: If a field does not fit in the block.
+        """
+        members = []
+        for index, block_field in enumerate(fields):
+            data_type, size, field_count = self.__normalize(
+                register_type, block_field.data_type, block_field.size
+            )
+            if block_field.offset < 0 or block_field.offset + field_count > count:
+                raise ValueError(
+                    f"Field {block_field.name} does not fit in a block of {count}"
+                )
+            members.append((index, block_field.offset, data_type, size))
+
+        read_fn = self.__readers[register_type._ordinal]
+        names = [block_field.name for block_field in fields]
+
+        async def read_fields() -> dict:
+            response = await self.__request(read_fn, start, count)
+            results = [None] * len(names)
+            self.__decode_run(register_type, response, members, results)
+            return dict(zip(names, results))
+
+        return read_fields
+
+    def __decode_run(
+        self,
+        register_type: PLCRegisterType,
+        response: ModbusResponse,
+        members: list[tuple[int, int, PLCValueType, int]],
+        results: list,
+    ):
+        """
+        Decode the values of a run from its response into `results`.
+        """
+        # Bits are taken straight from the response without a decoder
+        if register_type.default_vtype is PLCValueType.BOOL:
+            bits = response.bits
+            for index, offset, *_ in members:
+                results[index] = bits[offset]
+            return
+
+        # Convert the run once and decode every value from its offset in it
+        registers = response.registers
+        payload = self.__payload(registers)
+        decoder = None
+        for index, offset, data_type, size in members:
+            # A single decoder serves all strings of the run
+            if data_type is PLCValueType.STRING and decoder is None:
+                decoder = self.__decoder(registers)
+            try:
+                results[index] = self.__decode(
+                    payload, decoder, offset, data_type, size
+                )
+            except PLCDecodeError as exc:
+                results[index] = exc
+
+    @staticmethod
+    def __normalize(
+        register_type: PLCRegisterType, data_type: PLCValueType, size: int
+    ) -> tuple[PLCValueType, int, int]:
+        """
+        Resolve the data type and size of a value, and the number of registers it spans.
+        """
+        data_type = register_type.default_vtype or data_type
+        size = data_type.size_bytes or size
+        count = 1 if data_type is PLCValueType.BOOL else (size + 1) >> 1
+        return data_type, size, count
+
+    def __coalesce(
+        self, specs: list[ReadSpec]
+    ) -> list[tuple[PLCRegisterType, int, int, list[tuple]]]:
+        """
+        Group the read specs into runs of nearby addresses.
+
+        :returns: `(register_type, start, count, members)` per run, where `members`
+            holds `(spec index, offset from start, data type, size)` tuples.
+        """
+        normalized = []
+        for index, spec in enumerate(specs):
+            address, register_type = spec.address, spec.register_type
+            data_type, size, count = self.__normalize(
+                register_type, spec.data_type, spec.size
             )
+            normalized.append((register_type, address, count, index, data_type, size))
+
+        normalized.sort(key=lambda n: (n[0].value, n[1]))
+
+        runs = []
+        for register_type, address, count, index, data_type, size in normalized:
+            if runs:
+                run_type, start, run_count, members = runs[-1]
+                end = max(start + run_count, address + count)
+                if (
+                    run_type == register_type
+                    and address <= start + run_count + self._max_gap
+                    and end - start <= self._max_read_count[register_type._ordinal]
+                ):
+                    members.append((index, address - start, data_type, size))
+                    runs[-1] = (run_type, start, end - start, members)
+                    continue
+
+            runs.append((register_type, address, count, [(index, 0, data_type, size)]))
+
+        return runs
+
+    async def __request(
+        self, read_fn: callable, address: int, count: int
+    ) -> ModbusResponse:
+        try:
+            response = await read_fn(address=address, count=count)
         except ModbusException as exc:
             raise PLCReadError("Connection failed during read.") from exc
 
         if response.isError():
             raise PLCReadError(
-                f"Unable to process register {RegisterAddress(address)} using {read_fn.__name__}"
+                f"Unable to process register 0x{address:04x} using {read_fn.__name__}"
             )
 
-        decoder = PLCReader.REGISTER_DECODERS[register_type](
-            r=response,
-            e=self._endianness.as_modbus_endian(),
-            w=self._word_order.as_modbus_endian(),
+        return response
+
+    def __payload(self, registers: list[int]) -> bytes:
+        words = array("H", registers)
+        if self._swap_payload:
+            words.byteswap()
+        return words.tobytes()
+
+    def __decoder(self, registers: list[int]) -> BPD:
+        return BPD.fromRegisters(
+            registers, byteorder=self._mb_endian, wordorder=self._mb_word
         )
-        decode_func = {
-            PLCValueType.UINT8: decoder.decode_8bit_uint,
-            PLCValueType.UINT16: decoder.decode_16bit_uint,
-            PLCValueType.UINT32: decoder.decode_32bit_uint,
-            PLCValueType.UINT64: decoder.decode_64bit_uint,
-            PLCValueType.INT8: decoder.decode_8bit_int,
-            PLCValueType.INT16: decoder.decode_16bit_int,
-            PLCValueType.INT32: decoder.decode_32bit_int,
-            PLCValueType.INT64: decoder.decode_64bit_int,
-            PLCValueType.FLOAT16: decoder.decode_16bit_float,
-            PLCValueType.FLOAT32: decoder.decode_32bit_float,
-            PLCValueType.FLOAT64: decoder.decode_64bit_float,
-            PLCValueType.CHAR: lambda: decoder.decode_string(size=1),
-            PLCValueType.STRING: lambda: decoder.decode_string(size=size),
-            PLCValueType.BOOL: lambda: response.bits[0]
-            if self._endianness == PLCEndianness.BIG
-            else response.bits[-1],
-        }[data_type]
+
+    def __decode(
+        self,
+        payload: bytes | None,
+        decoder: BPD | None,
+        offset: int,
+        data_type: PLCValueType,
+        size: int,
+    ) -> int | float | bytes:
         try:
-            decode_value = decode_func()
-            return decode_value
+            if data_type is PLCValueType.STRING:
+                decoder.reset()
+                decoder.skip_bytes(offset * 2)
+                return decoder.decode_string(size=size)
+            return self._unpackers[data_type._ordinal](payload, offset * 2)[0]
         except Exception as exc:
             raise PLCDecodeError(f"Could not decode data as {data_type}") from exc
 
@@ -332,15 +800,91 @@ class PLCReader:
 
         :raises PLCReadConnectionError: If the connection could not be established.
         """
-        try:
-            assert await self.__client.connect()
-        except AssertionError as exc:
+        if not await self.__client.connect():
             raise PLCReadConnectionError(
                 f"Could not connect to PLC (host: {self._host}, port: {self._port})"
-            ) from exc
+            )
+
+    @property
+    def connected(self) -> bool:
+        """
+        Whether the connection to the PLC is open.
+        """
+        return self.__client.connected
 
     def close(self):
         """
         Close the connection to the PLC.
         """
         self.__client.close()
+
+
+class PLCReaderPool:
+    """
+    Keeps a persistent reader for each PLC and reads from all of them concurrently.
+
+    Requests to the same PLC are serialized, as the modbus client does not support
+    concurrent requests on one connection.
+
+    Usage:
+
+    ```py
+    pool = PLCReaderPool()
+    pool.add(host="10.0.0.1", port=502)
+    pool.add(host="10.0.0.2", port=502, endianness=PLCEndianness.LITTLE)
+    results = await pool.gather_read({
+        ("10.0.0.1", 502): [ReadSpec(0, PLCRegisterType.COILS)],
+        ("10.0.0.2", 502): [ReadSpec(0, PLCRegisterType.HOLDING_REGISTERS)],
+    })
+    pool.close()
+    ```
+    """
+
+    def __init__(self):
+        self._readers: dict[tuple[str, int], PLCReader] = {}
+        self._locks: dict[tuple[str, int], asyncio.Lock] = {}
+
+    def add(self, host: str, port: int = 502, **kwargs) -> PLCReader:
+        """
+        Add a PLC to the pool.
+
+        :param kwargs: The remaining arguments of `PLCReader`.
+        :returns: The reader of the PLC. An existing reader is returned as is.
+        """
+        key = (host, port)
+        if key not in self._readers:
+            self._readers[key] = PLCReader(host=host, port=port, **kwargs)
+            self._locks[key] = asyncio.Lock()
+        return self._readers[key]
+
+    async def gather_read(
+        self, specs_by_plc: dict[tuple[str, int], list[ReadSpec]]
+    ) -> dict[tuple[str, int], list | PLCReadException]:
+        """
+        Read from the PLCs concurrently.
+
+        :param specs_by_plc: The values to read, keyed by the `(host, port)` of a PLC
+            added to the pool.
+        :returns: The result of `PLCReader.read_many` for each PLC, or the
+            `PLCReadException` raised when the PLC could not be connected to.
+        """
+        results = await asyncio.gather(
+            *(self.__read_one(key, specs) for key, specs in specs_by_plc.items()),
+            return_exceptions=True,
+        )
+        return dict(zip(specs_by_plc, results))
+
+    async def __read_one(self, key: tuple[str, int], specs: list[ReadSpec]) -> list:
+        reader = self._readers[key]
+        async with self._locks[key]:
+            # Reconnect a connection that was dropped since the last read
+            if not reader.connected:
+                await reader.connect()
+            return await reader.read_many(specs)
+
+    def close(self):
+        """
+        Close the connections to all PLCs.
+        """
+        for reader in self._readers.values():
+            reader.close()